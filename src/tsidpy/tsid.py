@@ -1,10 +1,13 @@
 
-import functools
+import itertools
+import os
 import random
 import threading
 import time
 import typing as t
+import weakref
 
+from collections import deque
 from datetime import datetime
 
 from .basen import decode, encode
@@ -22,25 +25,49 @@ RANDOM_MASK: int = 0x3fffff
 TSID_DEFAULT_NODE_BITS = 10
 
 ALPHABET: str = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
-ALPHABET_VALUES: list[int] = [-1 for _ in range(128)]
+# Case insensitive, with O as 0 and I, L as 1.
+# Invalid chars are set to 0xff (any value >= 32)
+_alphabet_values: dict[str, int] = {c: i for i, c in enumerate(ALPHABET)}
+_alphabet_values.update({'O': 0, 'I': 1, 'L': 1})
+ALPHABET_VALUES: bytes = bytes(_alphabet_values.get(chr(i).upper(), 0xff)
+                               for i in range(128))
+del _alphabet_values
 
+_HEX_DIGITS: frozenset[str] = frozenset('0123456789abcdefABCDEF')
 
-def __set_alphabet_values(chars: str, start: int) -> None:
-    for i, c in enumerate(chars):
-        ALPHABET_VALUES[ord(c)] = start + i
-        ALPHABET_VALUES[ord(c.upper())] = start + i
+# Two canonical chars (10 bits) per entry
+_ALPHABET_PAIRS: list[str] = [ALPHABET[i >> 5] + ALPHABET[i & 0x1f]
+                              for i in range(1024)]
 
 
-__set_alphabet_values('0123456789', 0)
-__set_alphabet_values('abcdefghjkmnpqrstvwxyz', 0xa)
-__set_alphabet_values('oi', 0)
-__set_alphabet_values('l', 1)
+def _encode_canonical(n: int) -> str:
+    pairs: list[str] = _ALPHABET_PAIRS
+    return ''.join((ALPHABET[n >> 60],
+                    pairs[n >> 50 & 0x3ff],
+                    pairs[n >> 40 & 0x3ff],
+                    pairs[n >> 30 & 0x3ff],
+                    pairs[n >> 20 & 0x3ff],
+                    pairs[n >> 10 & 0x3ff],
+                    pairs[n & 0x3ff]))
+
+
+# `random.Random` instances owned by generators. Unlike the global random
+# state, they are not reseeded after `os.fork()`, so we do it ourselves.
+_owned_rngs: 'weakref.WeakSet[random.Random]' = weakref.WeakSet()
+
+
+def _reseed_owned_rngs() -> None:
+    for rng in _owned_rngs:
+        rng.seed()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reseed_owned_rngs)
 
 
 _default_generator: 'TSIDGenerator'
 
 
-@functools.total_ordering
 class TSID:
     """A value object that represents a Time-Sorted Unique Identifier (TSID).
 
@@ -67,13 +94,31 @@ class TSID:
        See [Snowflake ID](https://en.wikipedia.org/wiki/Snowflake_ID).
     """
 
+    __slots__ = ('_TSID__number', '_epoch', '__weakref__')
+
     def __init__(self, number: int) -> None:
         """
         >>> TSID(0x10000000000000000).number == 0
         True
         """
         self.__number: int = number & 0xffffffffffffffff  # 64-bit
-        self._epoch: float = TSID_EPOCH
+
+    @classmethod
+    def _from_raw(cls, number: int, epoch: float = TSID_EPOCH) -> 'TSID':
+        """Builds a TSID skipping the 64-bit mask of `__init__`.
+           The caller must guarantee that `0 <= number < 2^64`.
+
+        >>> TSID._from_raw(0xffff) == TSID(0xffff)
+        True
+        >>> TSID._from_raw(1 << RANDOM_BITS, epoch=0).timestamp
+        1.0
+        """
+        result: TSID = cls.__new__(cls)
+        result.__number = number
+        # `_epoch` is only set for non-default epochs
+        if epoch != TSID_EPOCH:
+            result._epoch = epoch
+        return result
 
     @property
     def timestamp(self) -> float:
@@ -88,7 +133,8 @@ class TSID:
         >>> TSID(1 << RANDOM_BITS).timestamp == TSID_EPOCH + 1
         True
         """
-        return self._epoch + (self.__number >> RANDOM_BITS)
+        epoch: float = getattr(self, '_epoch', TSID_EPOCH)
+        return float(epoch + (self.__number >> RANDOM_BITS))
 
     @property
     def random(self) -> int:
@@ -123,33 +169,120 @@ class TSID:
         """
         >>> TSID(0) < TSID(1)
         True
+        >>> TSID(1) < TSID(0)
+        False
+        >>> TSID(0) < 1000
+        Traceback (most recent call last):
+        ...
+        TypeError: '<' not supported between instances of 'TSID' and 'int'
+        """
+        if isinstance(other, TSID):
+            return self.__number < other.__number
+        return NotImplemented
+
+    def __le__(self, other: object) -> bool:
+        """
+        >>> TSID(0) <= TSID(0)
+        True
+        >>> TSID(1) <= TSID(0)
+        False
+        """
+        if isinstance(other, TSID):
+            return self.__number <= other.__number
+        return NotImplemented
+
+    def __gt__(self, other: object) -> bool:
+        """
         >>> TSID(1) > TSID(0)
         True
-        >>> TSID(0) < 1000
+        >>> TSID(0) > TSID(0)
         False
         """
         if isinstance(other, TSID):
-            return self.__number < other.__number
-        return False
+            return self.__number > other.__number
+        return NotImplemented
+
+    def __ge__(self, other: object) -> bool:
+        """
+        >>> TSID(0) >= TSID(0)
+        True
+        >>> TSID(0) >= TSID(1)
+        False
+        """
+        if isinstance(other, TSID):
+            return self.__number >= other.__number
+        return NotImplemented
 
     def __eq__(self, other: object) -> bool:
         """
         >>> TSID(0) == TSID(0)
         True
+        >>> TSID(0) == 0
+        False
+        """
+        if isinstance(other, TSID):
+            return self.__number == other.__number
+        return NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        """
+        >>> TSID(0) != TSID(1)
+        True
         >>> TSID(0) != 0
         True
         >>> TSID(0) != '0'
         True
         """
         if isinstance(other, TSID):
-            return self.__number == other.__number
-        return False
+            return self.__number != other.__number
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """
+        >>> hash(TSID(1)) == hash(TSID(1))
+        True
+        >>> len({TSID(1), TSID(1), TSID(2)})
+        2
+        """
+        return hash(self.__number)
+
+    def __reduce__(self) -> tuple[t.Any, ...]:
+        """Pickles a TSID as its number and epoch, for every protocol.
+
+        >>> import pickle
+        >>> t = TSID._from_raw(1 << RANDOM_BITS, epoch=0)
+        >>> for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        ...     t2 = pickle.loads(pickle.dumps(t, protocol))
+        ...     assert t2 == t and t2.timestamp == 1.0, protocol
+        >>> t = pickle.loads(pickle.dumps(TSID(1), 0))
+        >>> t == TSID(1) and t.timestamp == TSID(1).timestamp
+        True
+        """
+        return (TSID._from_raw,
+                (self.__number, getattr(self, '_epoch', TSID_EPOCH)))
+
+    def __setstate__(self, state: t.Any) -> None:
+        """Restores a TSID pickled before `__reduce__` was defined.
+           Pickles written before `__slots__` hold a plain `__dict__`.
+
+        >>> import weakref
+        >>> t = TSID.__new__(TSID)
+        >>> t.__setstate__({'_TSID__number': 1, '_epoch': TSID_EPOCH})
+        >>> t == TSID(1)
+        True
+        >>> weakref.ref(t)() is t
+        True
+        """
+        if isinstance(state, tuple):
+            state = state[1]
+        for name, value in (state or {}).items():
+            setattr(self, name, value)
 
     def __repr__(self) -> str:
-        return self._to_canonical_string()
+        return _encode_canonical(self.__number)
 
     def __str__(self) -> str:
-        return self._to_canonical_string()
+        return _encode_canonical(self.__number)
 
     def to_bytes(self) -> bytes:
         r"""Converts the TSID into a byte array.
@@ -170,8 +303,7 @@ class TSID:
         >>> t .to_bytes() == b'\xff\xca\xfe\xfa\xba\xda\xbe\xef'
         True
         """
-        return self.__number.to_bytes(TSID_BYTES, byteorder='big',
-                                      signed=False)
+        return self.__number.to_bytes(TSID_BYTES, 'big')
 
     def to_string(self, fmt: str = 'S') -> str:
         """Converts the TSID into a string.
@@ -209,30 +341,10 @@ class TSID:
         'WIlLsHwljH'
         """
 
-        result: str
-
-        match fmt:
-            case 'S':  # canonical string in upper case
-                result = self._to_canonical_string()
-            case 's':  # canonical string in lower case
-                result = self._to_canonical_string().lower()
-            case 'X':  # hexadecimal in upper case
-                result = encode(self.number, 16, min_length=TSID_BYTES*2)
-            case 'x':  # hexadecimal in lower case
-                result = encode(self.number, 16, min_length=TSID_BYTES*2)
-                result = result.lower()
-            case 'd':  # base-10
-                result = encode(self.number, 10)
-            case 'z':  # base-62
-                result = encode(self.number, 62)
-            case _:
-                raise ValueError(f"Invalid format: '{fmt}'")
-
-        return result
-
-    def _to_canonical_string(self) -> str:
-        return ''.join(ALPHABET[self.__number >> i & 0x1f]
-                       for i in range(60, -5, -5))
+        fn = _TO_STRING.get(fmt)
+        if fn is None:
+            raise ValueError(f"Invalid format: '{fmt}'")
+        return fn(self)
 
     @staticmethod
     def create() -> 'TSID':
@@ -275,8 +387,8 @@ class TSID:
             raise ValueError(f'Invalid TSID bytes (len={len(bytes)} bytes, '
                              f'expected {TSID_BYTES})')
 
-        number: int = int.from_bytes(bytes, byteorder='big', signed=False)
-        return TSID(number)
+        number: int = int.from_bytes(bytes, 'big')
+        return TSID._from_raw(number)
 
     @staticmethod
     def from_string(value: str, fmt: str = 'S') -> 'TSID':
@@ -294,37 +406,47 @@ class TSID:
         >>> t2 = TSID.from_string('0AXFXR5W7VBX0')
         >>> t1.number == t2.number
         True
+        >>> TSID.from_string('0axfxr5w7vbxo', 's') == t2
+        True
+        >>> TSID.from_string('0AXFXR5W7VBX!')
+        Traceback (most recent call last):
+        ...
+        ValueError: Invalid TSID string: '0AXFXR5W7VBX!'
+        >>> TSID.from_string('0AXFXR5W7VBXé')
+        Traceback (most recent call last):
+        ...
+        ValueError: Invalid TSID string: '0AXFXR5W7VBXé'
+
+        >>> TSID.from_string('0575fdc1787dafa0', 'x') == t1
+        True
+        >>> TSID.from_string('0x75FDC1787DAFA0', 'X')
+        Traceback (most recent call last):
+        ...
+        ValueError: Invalid TSID string: '0x75FDC1787DAFA0'
+        >>> TSID.from_string(' 575FDC1787DAFA ', 'X')
+        Traceback (most recent call last):
+        ...
+        ValueError: Invalid TSID string: ' 575FDC1787DAFA '
+        >>> TSID.from_string('-575FDC1787DAFA0', 'x')
+        Traceback (most recent call last):
+        ...
+        ValueError: Invalid TSID string: '-575FDC1787DAFA0'
+        >>> for value in ('-5', '+5', ' 5', '1_2', '١٢٣', ''):
+        ...     try:
+        ...         TSID.from_string(value, 'd')
+        ...     except ValueError as e:
+        ...         print(e)
+        Invalid TSID string: '-5'
+        Invalid TSID string: '+5'
+        Invalid TSID string: ' 5'
+        Invalid TSID string: '1_2'
+        Invalid TSID string: '١٢٣'
+        Invalid TSID string: ''
         """
-        number: int
-
-        match fmt:
-            case 'S' | 's':
-                if len(value) != TSID_CHARS:
-                    raise ValueError(f'Invalid TSID string: '
-                                     f'(len={len(value)} chars, '
-                                     f'but expected {TSID_CHARS})')
-                number = sum(ALPHABET_VALUES[ord(value[i])] << h
-                             for i, h in enumerate(range(60, -5, -5), 0))
-            case 'X':  # hexadecimal in upper case
-                if len(value) != TSID_HEXCHARS:
-                    raise ValueError(f'Invalid TSID string: '
-                                     f'(len={len(value)} chars, '
-                                     f'but expected {TSID_HEXCHARS})')
-                number = decode(value, 16)
-            case 'x':  # hexadecimal in lower case
-                if len(value) != TSID_HEXCHARS:
-                    raise ValueError(f'Invalid TSID string: '
-                                      f'(len={len(value)} chars, '
-                                     f'but expected {TSID_HEXCHARS})')
-                number = decode(value.upper(), 16)
-            case 'd':  # base-10
-                number = decode(value, 10)
-            case 'z':  # base-62
-                number = decode(value, 62)
-            case _:
-                raise ValueError(f"Invalid format: '{fmt}'")
-
-        return TSID(number)
+        fn = _FROM_STRING.get(fmt)
+        if fn is None:
+            raise ValueError(f"Invalid format: '{fmt}'")
+        return TSID(fn(value))
 
     @staticmethod
     def set_default_generator(generator: 'TSIDGenerator') -> None:
@@ -337,13 +459,80 @@ class TSID:
         _default_generator = generator
 
 
+def _check_length(value: str, expected: int) -> None:
+    if len(value) != expected:
+        raise ValueError(f'Invalid TSID string: '
+                         f'(len={len(value)} chars, '
+                         f'but expected {expected})')
+
+
+def _decode_canonical(value: str) -> int:
+    _check_length(value, TSID_CHARS)
+    if not value.isascii():
+        raise ValueError(f"Invalid TSID string: '{value}'")
+    values: bytes = ALPHABET_VALUES
+    n: int = 0
+    for b in value.encode('ascii'):
+        v = values[b]
+        if v >= 32:
+            raise ValueError(f"Invalid TSID string: '{value}'")
+        n = n << 5 | v
+    return n
+
+
+def _decode_hex(value: str) -> int:
+    _check_length(value, TSID_HEXCHARS)
+    # int() also accepts signs, prefixes, whitespace and '_'
+    if not _HEX_DIGITS.issuperset(value):
+        raise ValueError(f"Invalid TSID string: '{value}'")
+    return int(value, 16)
+
+
+def _decode_dec(value: str) -> int:
+    # int() also accepts signs, whitespace, '_' and non-ASCII digits
+    if not (value.isascii() and value.isdigit()):
+        raise ValueError(f"Invalid TSID string: '{value}'")
+    return int(value, 10)
+
+
+_TO_STRING: dict[str, t.Callable[[TSID], str]] = {
+    # canonical string in upper case
+    'S': lambda tsid: _encode_canonical(tsid.number),
+    # canonical string in lower case
+    's': lambda tsid: _encode_canonical(tsid.number).lower(),
+    # hexadecimal in upper case
+    'X': lambda tsid: f'{tsid.number:016X}',
+    # hexadecimal in lower case
+    'x': lambda tsid: f'{tsid.number:016x}',
+    # base-10
+    'd': lambda tsid: str(tsid.number),
+    # base-62
+    'z': lambda tsid: encode(tsid.number, 62),
+}
+
+_FROM_STRING: dict[str, t.Callable[[str], int]] = {
+    'S': _decode_canonical,
+    's': _decode_canonical,
+    'X': _decode_hex,
+    'x': _decode_hex,
+    'd': _decode_dec,
+    'z': lambda value: decode(value, 62),
+}
+
+
 class TSIDGenerator:
+    __slots__ = ('random_fn', 'node', '_epoch', '_epoch_ms', '_node_bits',
+                 '_counter_bits', '_counter_mask', '_node_mask',
+                 '_node_shifted', '_state', '_counter', '_lock',
+                 '__weakref__')
+
     def __init__(
         self,
         node: int | None = None,
         node_bits: int = TSID_DEFAULT_NODE_BITS,
         epoch: float = TSID_EPOCH,
-        random_fn: t.Callable[[int], int] | None = None
+        random_fn: t.Callable[[int], int] | None = None,
+        secure: bool = False
     ) -> None:
         """Creates a new TSID generator.
 
@@ -356,7 +545,13 @@ class TSIDGenerator:
                              `TSID_EPOCH`.
         - `random_fn`:       Function to use to randomize the counter.
                              Must return a n-bit integer. If None, the
-                             stdlib `random.getrandbits()` is used.
+                             `getrandbits()` method of a `random.Random`
+                             instance owned by this generator is used,
+                             so generators don't share the global random
+                             state.
+        - `secure` bool:     If True and no `random_fn` is given, use
+                             `random.SystemRandom` instead. Defaults to
+                             False.
 
         >>> generator = TSIDGenerator(node=1, node_bits=21)
         Traceback (most recent call last):
@@ -376,6 +571,33 @@ class TSIDGenerator:
         >>> generator = TSIDGenerator(node=1, node_bits=1)
         >>> generator.node
         1
+
+        >>> TSIDGenerator(epoch=1078625331859.9999)._epoch_ms
+        1078625331860
+
+        >>> generator = TSIDGenerator(node_bits=20, secure=True)
+        >>> isinstance(generator.random_fn.__self__, random.SystemRandom)
+        True
+        >>> a, b = TSIDGenerator(), TSIDGenerator()
+        >>> type(a.random_fn.__self__) is random.Random
+        True
+        >>> a.random_fn.__self__ is b.random_fn.__self__
+        False
+
+        >>> ### Test the counter RNG diverges after fork ----------------
+        >>> if hasattr(os, 'fork'):
+        ...     rfd, wfd = os.pipe()
+        ...     if os.fork() == 0:
+        ...         os.write(wfd, b'%d' % _default_generator.random_fn(64))
+        ...         os._exit(0)
+        ...     os.close(wfd)
+        ...     _ = os.wait()
+        ...     child = int(os.read(rfd, 32))
+        ...     os.close(rfd)
+        ...     print(child != _default_generator.random_fn(64))
+        ... else:
+        ...     print(True)
+        True
         """
         if node is not None and node < 0:
             raise ValueError(f'Invalid node: {node}')
@@ -383,7 +605,15 @@ class TSIDGenerator:
         if node_bits < 0 or node_bits > 20:
             raise ValueError(f'Invalid node_bits: {node_bits}')
 
-        self.random_fn = random_fn or random.getrandbits
+        if random_fn is None:
+            rng: random.Random
+            if secure:
+                rng = random.SystemRandom()
+            else:
+                rng = random.Random()
+                _owned_rngs.add(rng)
+            random_fn = rng.getrandbits
+        self.random_fn: t.Callable[[int], int] = random_fn
 
         self.node: int
         if node is None:
@@ -396,18 +626,85 @@ class TSIDGenerator:
                              f'node_bits=={node_bits}')
 
         self._epoch: float = epoch
+        # Epochs computed as `timestamp() * 1000` may be off by a tiny
+        # fraction (e.g. 1078625331859.9999), so round instead of truncating
+        self._epoch_ms: int = round(epoch)
         self._node_bits: int = node_bits
         self._counter_bits: int = RANDOM_BITS - node_bits
-        self.counter: int = self.random_fn(self._counter_bits)
-
-        self._millis: float = time.time() * 1000
         self._counter_mask: int = RANDOM_MASK >> node_bits
         self._node_mask: int = RANDOM_MASK >> self._counter_bits
+        self._node_shifted: int = ((self.node & self._node_mask)
+                                   << self._counter_bits)
+
+        # Current millisecond, its time + node bits and its counter
+        # sequence. They are swapped together (under `_lock`) so a counter
+        # is never paired with a different millisecond. Drawing from the
+        # sequence is atomic under the GIL, so the same-millisecond path
+        # is lock-free.
+        counter: int = self.random_fn(self._counter_bits)
+        self._state: tuple[int, int, t.Iterator[int]] = self._new_state(
+            time.time_ns() // 1_000_000, counter + 1)
+        # Last counter handed out, only used by the `counter` property
+        self._counter: int = counter
 
         self._lock = threading.Lock()
 
-    def create(self) -> TSID:
+    @property
+    def counter(self) -> int:
+        """Returns the counter value of the last TSID created.
+
+        >>> tc = TSIDGenerator(node=0, node_bits=0, random_fn=lambda n: 0)
+        >>> _pin_clock(tc, 1000)  # stay in the same millisecond
+        >>> tc.counter
+        0
+        >>> _ = tc.create_many(2)
+        >>> tc.counter
+        2
+        >>> _ = tc.create()
+        >>> tc.counter
+        3
+        >>> tc.counter = 5  # doctest: +IGNORE_EXCEPTION_DETAIL
+        Traceback (most recent call last):
+        ...
+        AttributeError: read-only
+        """
+        return max(0, min(self._counter, self._counter_mask))
+
+    def _new_state(
+        self,
+        millis: int,
+        counter: int
+    ) -> tuple[int, int, t.Iterator[int]]:
+        base: int = ((millis - self._epoch_ms) << RANDOM_BITS
+                     | self._node_shifted)
+        return (millis, base, itertools.count(counter))
+
+    def _reseed(self, current_millis: int) -> None:
+        """Moves to `current_millis` with a new random counter,
+           unless another thread already did it.
         """
+        with self._lock:
+            if self._state[0] < current_millis:
+                rnd: int = self.random_fn(self._counter_bits)
+                self._state = self._new_state(current_millis,
+                                              rnd & self._counter_mask)
+
+    def _overflow(self, counter_iter: t.Iterator[int]) -> None:
+        """Moves to the next millisecond after `counter_iter` overflows,
+           unless another thread already did it.
+        """
+        with self._lock:
+            millis, _, current_iter = self._state
+            if current_iter is counter_iter:
+                self._state = self._new_state(millis + 1, 0)
+
+    def create(self) -> TSID:
+        """Returns a new TSID.
+
+           This method is thread-safe. The lock is only taken when the
+           millisecond changes or the counter overflows, so TSIDs created
+           within the same millisecond never wait on it.
+
         >>> ### Test node extraction ------------------------------
         >>> tc = TSIDGenerator(node=255, node_bits=8)
         >>> t = tc.create()
@@ -424,6 +721,7 @@ class TSIDGenerator:
 
         >>> ### Test counter extraction ------------------------------
         >>> tc = TSIDGenerator(node=64, node_bits=8, random_fn=lambda n: 0)
+        >>> _pin_clock(tc, 1000)  # stay in the same millisecond
         >>> t = tc.create()
         >>> t.number & tc._counter_mask == 1
         True
@@ -433,6 +731,7 @@ class TSIDGenerator:
 
         >>> ### Test random extraction ------------------------------
         >>> tc = TSIDGenerator(node=0, node_bits=0, random_fn=lambda n: 0)
+        >>> _pin_clock(tc, 1000)  # stay in the same millisecond
         >>> t = tc.create()
         >>> t.random == 1
         True
@@ -441,6 +740,7 @@ class TSIDGenerator:
         True
 
         >>> ### Test timestamp extraction ------------------------------
+        >>> tc = TSIDGenerator(node=0, node_bits=0)
         >>> t = tc.create()
         >>> t.timestamp - (time.time() * 1000) <= 1
         True
@@ -455,29 +755,96 @@ class TSIDGenerator:
         >>> t.timestamp - now_without_unix_epoch <= 1
         True
         """
-        with self._lock:
-            current_millis: float = time.time() * 1000
+        while True:
+            millis, base, counter_iter = self._state
 
-            # If same millisecond, increment counter
-            if current_millis - self._millis < 1:
-                self.counter += 1
+            # If the clock moved on, start a new millisecond
+            current_millis: int = time.time_ns() // 1_000_000
+            if current_millis > millis:
+                self._reseed(current_millis)
+                continue
 
-                # If the counter overflows, go to the next millisecond
-                if self.counter >> self._counter_bits != 0:
-                    self._millis += 1
-                    self.counter = 0
-            else:
-                self._millis = current_millis
-                rnd: int = self.random_fn(self._counter_bits)
-                self.counter = rnd & self._counter_mask
+            # If the counter overflows, go to the next millisecond
+            counter: int = next(counter_iter)
+            if counter > self._counter_mask:
+                self._overflow(counter_iter)
+                continue
+
+            self._counter = counter
+            return TSID._from_raw(base | counter, self._epoch)
+
+    def create_many(self, n: int) -> list[TSID]:
+        """Returns a list of `n` new TSIDs.
+
+           The result is the same as calling `create()` `n` times, but the
+           counters are reserved and the TSID numbers produced as ranges,
+           one per millisecond.
 
-            millis = int(self._millis - self._epoch) << RANDOM_BITS
-            node = (self.node & self._node_mask) << self._counter_bits
-            counter = self.counter & self._counter_mask
+        >>> tc = TSIDGenerator(node=0, node_bits=0, random_fn=lambda n: 0)
+        >>> _pin_clock(tc, 1000)  # stay in the same millisecond
+        >>> [t.random for t in tc.create_many(3)]
+        [1, 2, 3]
+        >>> tc.create().random
+        4
+        >>> tc.create_many(0)
+        []
+
+        >>> ### Test counter overflow ------------------------------
+        >>> tc = TSIDGenerator(node=3, node_bits=20, random_fn=lambda n: 2)
+        >>> _pin_clock(tc, -1)  # force a new millisecond
+        >>> ts = tc.create_many(5)
+        >>> [t.number & tc._counter_mask for t in ts]
+        [2, 3, 0, 1, 2]
+        >>> [(t.number & RANDOM_MASK) >> tc._counter_bits for t in ts]
+        [3, 3, 3, 3, 3]
+        >>> [t.timestamp - ts[0].timestamp for t in ts]
+        [0.0, 0.0, 1.0, 1.0, 1.0]
+        >>> ts == sorted(ts)
+        True
+        """
+        result: list[TSID] = []
+        from_raw = TSID._from_raw
+        counter_mask: int = self._counter_mask
+        epoch: float = self._epoch
+
+        while n > 0:
+            millis, base, counter_iter = self._state
+
+            current_millis: int = time.time_ns() // 1_000_000
+            if current_millis > millis:
+                self._reseed(current_millis)
+                continue
+
+            # Reserve `count` consecutive counters in a single C-level call
+            count = min(n, counter_mask + 1)
+            last: int = deque(itertools.islice(counter_iter, count),
+                              maxlen=1)[0]
+            first: int = last - count + 1
+
+            overflow: bool = last > counter_mask
+            if overflow:
+                count = max(0, counter_mask + 1 - first)
+
+            result.extend(map(from_raw,
+                              range(base + first, base + first + count),
+                              itertools.repeat(epoch, count)))
+            n -= count
+            if count > 0:
+                self._counter = first + count - 1
+
+            if overflow:
+                self._overflow(counter_iter)
 
-            result = TSID(millis + node + counter)
-            result._epoch = self._epoch
-            return result
+        return result
+
+
+def _pin_clock(generator: TSIDGenerator, offset_ms: int) -> None:
+    """Shifts the current millisecond of `generator` by `offset_ms`.
+       Used by the doctests: a positive offset keeps `create()` in the
+       same millisecond, a negative one forces a new millisecond.
+    """
+    millis, base, counter_iter = generator._state
+    generator._state = (millis + offset_ms, base, counter_iter)
 
 
 _default_generator = TSIDGenerator(node_bits=0)